@@ -1,35 +1,73 @@
 from __future__ import annotations
+import asyncio
 import logging
+import time
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
 from .coordinator import SolarPrognoseCoordinator
-from .const import DOMAIN
+from .ledger import async_get_ledger
+from .const import DOMAIN, FIRST_REFRESH_RETRY_DELAYS
 
 _LOGGER = logging.getLogger(__name__)
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    setup_started = time.monotonic()
     hass.data.setdefault(DOMAIN, {})
 
     # Nutze Optionen falls vorhanden, sonst Basis-Daten
     api_url = entry.options.get("api_url", entry.data.get("api_url"))
     api_key = entry.options.get("api_key", entry.data.get("api_key"))
 
-    coordinator = SolarPrognoseCoordinator(hass, api_url, api_key)
+    # Gemeinsames Abfrageprotokoll, damit alle Eintraege mit demselben Key gemeinsam zaehlen
+    ledger = await async_get_ledger(hass)
+    coordinator = SolarPrognoseCoordinator(hass, api_url, api_key, ledger=ledger)
 
-    try:
-        await coordinator.async_config_entry_first_refresh()
-    except Exception as ex:
-        raise ConfigEntryNotReady(f"Solarprognose API nicht erreichbar: {ex}") from ex
+    # Im verzoegerten Modus wartet der HA-Start nicht auf die API, die Entitaeten
+    # starten mit ihrem letzten bekannten Zustand und der erste Abruf laeuft im Hintergrund
+    deferred = entry.options.get("deferred_setup", False)
 
+    if not deferred:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception as ex:
+            raise ConfigEntryNotReady(f"Solarprognose API nicht erreichbar: {ex}") from ex
+
+    coordinator.first_refresh_pending = deferred
     hass.data[DOMAIN][entry.entry_id] = {"coordinator": coordinator}
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(update_listener))
+
+    if deferred:
+        entry.async_create_background_task(
+            hass, _async_first_refresh(coordinator), f"{DOMAIN}_first_refresh_{entry.entry_id}"
+        )
+
+    coordinator.setup_duration = time.monotonic() - setup_started
+    _LOGGER.debug("Setup von %s dauerte %.3f s", entry.title, coordinator.setup_duration)
     return True
 
+async def _async_first_refresh(coordinator: SolarPrognoseCoordinator) -> None:
+    """Erster Abruf im Hintergrund, die Dauer wird fuer die Diagnose festgehalten."""
+    # Nach einem Neustart die ersten Abrufe mehrerer Eintraege staffeln
+    async with coordinator.scheduler.first_refresh_slot():
+        started = time.monotonic()
+        await coordinator.async_refresh()
+    coordinator.first_refresh_pending = False
+    coordinator.first_refresh_duration = time.monotonic() - started
+
+    # Ein kurzer Ausfall beim Start soll nicht bis zum naechsten regulaeren Abruf nachwirken.
+    # Jeder Versuch durchlaeuft die Limit-Pruefung des Coordinators.
+    for delay in FIRST_REFRESH_RETRY_DELAYS:
+        if coordinator.last_update_success:
+            return
+        _LOGGER.debug("Erster Abruf fehlgeschlagen, neuer Versuch in %s", delay)
+        await asyncio.sleep(delay.total_seconds())
+        await coordinator.async_refresh()
+
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     await hass.config_entries.async_reload(entry.entry_id)
 
@@ -6,7 +6,8 @@ from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from .const import DOMAIN
+from .const import API_REQUEST_LIMIT, DEFAULT_FORECAST_DAYS, DOMAIN, MAX_FORECAST_DAYS
+from .ledger import api_token, async_get_ledger
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,9 +21,17 @@ async def validate_input(hass, data):
         "https://www.solarprognose.de/web/solarprediction/api/v1"
         f"?access-token={api_key}&type=hourly&_format=json"
     )
+    token = api_token(url, api_key)
+
+    # Auch der Test-Aufruf verbraucht ein API-Credit und wird im gemeinsamen Protokoll gezaehlt
+    ledger = await async_get_ledger(hass)
+    if ledger.requests_in_window(token) >= API_REQUEST_LIMIT:
+        _LOGGER.warning("API-Limit erreicht, Validierung wird uebersprungen")
+        return None
 
     try:
         async with async_timeout.timeout(10):
+            ledger.async_record(token)
             session = async_get_clientsession(hass)
             async with session.get(url) as response:
                 res = await response.json()
@@ -68,25 +77,29 @@ class SolarPrognoseConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
 class SolarPrognoseOptionsFlowHandler(config_entries.OptionsFlow):
     """Behandelt Aenderungen in den Optionen."""
+    def _current(self, key):
+        return self.config_entry.options.get(key, self.config_entry.data.get(key, ""))
+
     async def async_step_init(self, user_input=None) -> FlowResult:
         if user_input:
-            await validate_input(self.hass, user_input)
+            # Der Test-Aufruf kostet ein API-Credit, daher nur bei geaenderten Zugangsdaten
+            if any((user_input.get(key) or "") != (self._current(key) or "")
+                   for key in ("api_key", "api_url")):
+                await validate_input(self.hass, user_input)
             return self.async_create_entry(title="", data=user_input)
 
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema({
+                vol.Optional("api_key", default=self._current("api_key")): str,
+                vol.Optional("api_url", default=self._current("api_url")): str,
                 vol.Optional(
-                    "api_key", 
-                    default=self.config_entry.options.get(
-                        "api_key", self.config_entry.data.get("api_key", "")
-                    )
-                ): str,
+                    "deferred_setup",
+                    default=self.config_entry.options.get("deferred_setup", False)
+                ): bool,
                 vol.Optional(
-                    "api_url", 
-                    default=self.config_entry.options.get(
-                        "api_url", self.config_entry.data.get("api_url", "")
-                    )
-                ): str,
+                    "forecast_days",
+                    default=self.config_entry.options.get("forecast_days", DEFAULT_FORECAST_DAYS)
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_FORECAST_DAYS)),
             }),
         )
\ No newline at end of file
@@ -1 +1,32 @@
-DOMAIN = "solarprognose_de_community"
\ No newline at end of file
+from datetime import timedelta
+
+DOMAIN = "solarprognose_de_community"
+
+# 150 Minuten Intervall entspricht ca. 10 Abfragen/Tag (Sicherheitspuffer für das 12er Limit)
+UPDATE_INTERVAL = timedelta(minutes=150)
+# Anzahl der Tage (ab heute), fuer die Tagessensoren angelegt werden
+DEFAULT_FORECAST_DAYS = 2
+MAX_FORECAST_DAYS = 7
+# Wartezeiten fuer erneute Versuche, wenn der erste Abruf im Hintergrund fehlschlaegt
+# (danach gilt wieder das normale Intervall)
+FIRST_REFRESH_RETRY_DELAYS = (
+    timedelta(seconds=30),
+    timedelta(minutes=1),
+    timedelta(minutes=2),
+    timedelta(minutes=5),
+)
+# Tageslimit von solarprognose.de je Zugangsschluessel
+API_REQUEST_LIMIT = 12
+
+# Gemeinsames Abfrageprotokoll aller Eintraege und des Config-Flows (siehe ledger.py)
+DATA_LEDGER = f"{DOMAIN}_ledger"
+
+# Gemeinsame Ablaufsteuerung aller Eintraege (siehe scheduler.py). Die Werte sind bewusst feste
+# Konstanten: der Scheduler gilt fuer alle Eintraege, eine Option je Eintrag waere widerspruechlich.
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+# Zeitfenster, ueber das die Abrufe der Eintraege zufaellig verteilt werden
+DEFAULT_REFRESH_SPREAD = timedelta(minutes=10)
+# Maximal gleichzeitig laufende API-Abfragen ueber alle Eintraege
+DEFAULT_MAX_PARALLEL_REQUESTS = 2
+# Mindestabstand zwischen zwei veroeffentlichten Ergebnissen, damit die Sensor-Updates nicht im selben Tick landen
+DEFAULT_REQUEST_SPACING = timedelta(seconds=2)
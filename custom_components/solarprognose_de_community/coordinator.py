@@ -1,45 +1,93 @@
 import logging
 import async_timeout
-from datetime import timedelta
+from datetime import datetime
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .const import API_REQUEST_LIMIT, DOMAIN, UPDATE_INTERVAL
+from .forecast import ForecastSeries
+from .ledger import QuotaLedger, api_token, async_get_ledger
+from .scheduler import async_get_scheduler
 
 _LOGGER = logging.getLogger(__name__)
 
 class SolarPrognoseCoordinator(DataUpdateCoordinator):
     """Zentrale Instanz zum Abrufen und Aufbereiten der Prognosedaten."""
     
-    def __init__(self, hass, api_url=None, api_key=None):
+    def __init__(self, hass, api_url=None, api_key=None, ledger: QuotaLedger | None = None):
         # Falls keine fertige URL geliefert wurde, bauen wir sie aus dem API-Key zusammen
         self.api_url = api_url or (
             "https://www.solarprognose.de/web/solarprediction/api/v1"
             f"?access-token={api_key}&type=hourly&_format=json"
         )
+        self.api_token = api_token(self.api_url, api_key)
+        self.ledger = ledger
         
-        # 150 Minuten Intervall entspricht ca. 10 Abfragen/Tag (Sicherheitspuffer für das 12er Limit)
-        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=timedelta(minutes=150))
+        # Gemeinsamer Scheduler verteilt die Abrufe aller Eintraege, statt alle gleichzeitig zu starten
+        self.scheduler = async_get_scheduler(hass)
+        super().__init__(
+            hass, _LOGGER, name=DOMAIN,
+            update_interval=self.scheduler.next_interval(UPDATE_INTERVAL),
+        )
         
         self.api_status = None
         self.api_message = ""
         self.next_api_request = None
         self.last_api_success = None
-        self.api_count_today = 0
-        self.last_reset_day = dt_util.now().date()
+        # Dauer von async_setup_entry bzw. des ersten Abrufs im verzoegerten Modus (Sekunden)
+        self.setup_duration = None
+        self.first_refresh_duration = None
+        # Verzoegertes Setup, dessen erster Abruf im Hintergrund noch aussteht
+        self.first_refresh_pending = False
+        # Alle Spalten der letzten API-Antwort, wird immer zusammen mit `data` gesetzt
+        self.series = ForecastSeries()
+
+    @property
+    def api_count_today(self) -> int:
+        """Abfragen dieses Schluessels im aktuellen Limit-Zeitraum, inkl. anderer Eintraege."""
+        return self.ledger.requests_in_window(self.api_token) if self.ledger else 0
+
+    def set_forecast(self, series: ForecastSeries) -> dict[datetime, float]:
+        """Uebernimmt eine neue Prognose und setzt `series` und `data` gemeinsam."""
+        self.series = series
+        self.data = dict(zip(series.times, series.power))
+        return self.data
 
     async def _async_update_data(self):
-        """Daten von der API abrufen und verarbeiten."""
+        """Daten abrufen und gestaffelt an die Sensoren weitergeben."""
+        series = await self._async_fetch()
+        # Die Sensoren werden direkt nach der Rueckgabe geschrieben, daher erst nach dem
+        # Mindestabstand zum zuletzt veroeffentlichten Ergebnis eines anderen Eintrags zurueckkehren
+        await self.scheduler.async_wait_publish()
+        if series is None:
+            return self.data or {}
+        return self.set_forecast(series)
+
+    async def _async_fetch(self) -> ForecastSeries | None:
+        """Daten von der API abrufen, None bedeutet: bisherige Daten behalten."""
         now = dt_util.now()
-        
-        # API-Zähler bei Datumswechsel zuruecksetzen
-        if now.date() > self.last_reset_day:
-            self.api_count_today = 0
-            self.last_reset_day = now.date()
+
+        if self.ledger is None:
+            self.ledger = await async_get_ledger(self.hass)
+
+        # Jeder Zyklus bekommt einen neuen Versatz, damit Eintraege nicht wieder zusammenlaufen
+        self.update_interval = self.scheduler.next_interval(UPDATE_INTERVAL)
             
         try:
-            async with async_timeout.timeout(20):
+            async with self.scheduler.slot(), async_timeout.timeout(20):
+                # Lieber eine Aktualisierung auslassen als vom Server gesperrt zu werden. Die Pruefung
+                # liegt hier und nicht im Scheduler, da nur der Coordinator seinen Schluessel kennt
+                if self.api_count_today >= API_REQUEST_LIMIT:
+                    _LOGGER.warning(
+                        "API-Limit von %s Abfragen erreicht, Abruf wird uebersprungen",
+                        API_REQUEST_LIMIT,
+                    )
+                    return None
+
+                # Schon vor dem Senden vermerken, damit parallele Eintraege mit demselben
+                # Schluessel die Abfrage sofort sehen (im Zweifel zaehlen wir eine zu viel)
+                self.ledger.async_record(self.api_token)
                 session = async_get_clientsession(self.hass)
                 async with session.get(self.api_url) as response:
                     res = await response.json()
@@ -49,7 +97,7 @@ class SolarPrognoseCoordinator(DataUpdateCoordinator):
                     # Status 0 bedeutet bei Solarprognose.de "Erfolg"
                     if self.api_status != 0:
                         _LOGGER.error("Solarprognose API Fehler: %s", self.api_message)
-                        return self.data or {}
+                        return None
 
                     self.last_api_success = now
                     
@@ -59,14 +107,13 @@ class SolarPrognoseCoordinator(DataUpdateCoordinator):
                         if ts_seconds > 0:
                             self.next_api_request = dt_util.utc_from_timestamp(ts_seconds)
                     
-                    # Rohdaten (Timestamps) in lokale Datetime-Objekte umwandeln
-                    processed_data = {}
+                    # Rohdaten (Timestamps) in lokale Datetime-Objekte umwandeln, alle Spalten behalten
+                    rows = {}
                     for ts, v in res.get("data", {}).items():
                         local_dt = dt_util.as_local(dt_util.utc_from_timestamp(int(ts)))
-                        processed_data[local_dt] = float(v[0])
-                        
-                    self.api_count_today += 1
-                    return processed_data
+                        rows[local_dt] = [float(x) for x in v]
+                    # Innerhalb des try aufbauen, damit fehlerhafte Zeilen zu UpdateFailed fuehren
+                    return ForecastSeries.from_rows(rows)
 
         except Exception as err:
             raise UpdateFailed(f"Verbindungsfehler zur API: {err}") from err
\ No newline at end of file
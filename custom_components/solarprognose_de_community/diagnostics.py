@@ -36,4 +36,8 @@ async def async_get_config_entry_diagnostics(
         "coordinator_data": coordinator.data,
         "api_status": coordinator.api_status,
         "api_message": coordinator.api_message,
+        "api_count_today": coordinator.api_count_today,
+        "setup_duration": coordinator.setup_duration,
+        "first_refresh_duration": coordinator.first_refresh_duration,
+        "data_inconsistencies": [dt.isoformat() for dt in coordinator.series.inconsistencies],
     }
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""Spaltenweise Ablage der stuendlichen Prognosewerte."""
+from __future__ import annotations
+
+import logging
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+_LOGGER = logging.getLogger(__name__)
+
+# Die API rundet auf Wh, daher tolerieren wir kleine Abweichungen der Tagessumme (kWh)
+CUMULATIVE_TOLERANCE = 0.01
+
+
+@dataclass
+class DayBucket:
+    """Kennzahlen eines Kalendertages, Indizes beziehen sich auf `ForecastSeries.times`."""
+
+    start: int
+    end: int
+    total: float = 0.0
+    peak_power: float = 0.0
+    peak_time: datetime | None = None
+
+
+@dataclass
+class ForecastSeries:
+    """Alle Spalten der API-Antwort, zeitlich sortiert.
+
+    Spalte 0 ist die Leistung der Stunde (kW bzw. kWh je Stunde), Spalte 1 die
+    von der API gelieferte kumulierte Tagesenergie (kWh).
+    """
+
+    times: list[datetime] = field(default_factory=list)
+    columns: list[list[float]] = field(default_factory=list)
+    cumulative: list[float] = field(default_factory=list)
+    inconsistencies: list[datetime] = field(default_factory=list)
+    days: dict[date, DayBucket] = field(default_factory=dict)
+
+    @classmethod
+    def from_rows(cls, rows: dict[datetime, list[float]]) -> ForecastSeries:
+        """Baut Spalten, kumulierte Tageswerte und Tagestabelle in einem Durchlauf auf."""
+        series = cls()
+        if not rows:
+            return series
+
+        width = min(len(values) for values in rows.values())
+        series.columns = [[] for _ in range(width)]
+        own_cumulative = []
+        running = 0.0
+
+        for index, (dt, values) in enumerate(sorted(rows.items())):
+            if dt.date() not in series.days:
+                bucket = series.days[dt.date()] = DayBucket(start=index, end=index)
+                running = 0.0
+            bucket.end = index + 1
+            # Bei gleicher Leistung gewinnt die spaetere Stunde
+            if bucket.peak_time is None or values[0] >= bucket.peak_power:
+                bucket.peak_power = values[0]
+                bucket.peak_time = dt
+            running += values[0]
+            own_cumulative.append(running)
+            series.times.append(dt)
+            for column, value in zip(series.columns, values):
+                column.append(value)
+
+        # Die kumulierte Reihe der API nur verwenden, wenn sie zu unseren eigenen Summen passt
+        if width > 1:
+            series.inconsistencies = [
+                dt for dt, api, own in zip(series.times, series.columns[1], own_cumulative)
+                if abs(api - own) > CUMULATIVE_TOLERANCE
+            ]
+            if series.inconsistencies:
+                _LOGGER.warning(
+                    "Kumulierte Tageswerte der API weichen an %s Zeitpunkten ab (erster: %s), "
+                    "verwende eigene Summen",
+                    len(series.inconsistencies), series.inconsistencies[0].isoformat(),
+                )
+            else:
+                series.cumulative = series.columns[1]
+        if not series.cumulative:
+            series.cumulative = own_cumulative
+        for bucket in series.days.values():
+            bucket.total = series.cumulative[bucket.end - 1]
+        return series
+
+    @property
+    def power(self) -> list[float]:
+        """Stundenwerte (Spalte 0)."""
+        return self.columns[0] if self.columns else []
+
+    def energy_until(self, moment: datetime, inclusive: bool = True) -> float:
+        """Kumulierte Tagesenergie bis einschliesslich `moment` (bzw. nur davor)."""
+        if (bucket := self.days.get(moment.date())) is None:
+            return 0.0
+        find = bisect_right if inclusive else bisect_left
+        index = find(self.times, moment, bucket.start, bucket.end) - 1
+        return self.cumulative[index] if index >= bucket.start else 0.0
+
+    def day_total(self, day: date) -> float:
+        """Gesamtenergie eines Kalendertages."""
+        return bucket.total if (bucket := self.days.get(day)) else 0.0
@@ -0,0 +1,114 @@
+"""Dauerhaft gespeichertes Protokoll der API-Abfragen je Zugangsschluessel."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from collections.abc import Callable
+from datetime import datetime
+from urllib.parse import parse_qs, urlparse
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_LEDGER, DOMAIN
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.quota"
+# Schreibzugriffe buendeln; Home Assistant speichert ausstehende Daten beim Beenden
+SAVE_DELAY = 10
+
+
+def api_token(api_url: str | None, api_key: str | None) -> str:
+    """Ermittelt den Zugangsschluessel, ueber den solarprognose.de das Limit zaehlt."""
+    if api_key:
+        return api_key
+    query = parse_qs(urlparse(api_url or "").query)
+    return query.get("access-token", [api_url or ""])[0]
+
+
+class QuotaLedger:
+    """Zeitstempel aller Abfragen je Schluessel, gemeinsam fuer Coordinator und Config-Flow."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._store: Store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._requests: dict[str, list[float]] = {}
+        self._listeners: dict[str, list[Callable[[], None]]] = {}
+        self._unsub_midnight: CALLBACK_TYPE | None = None
+        self._lock = asyncio.Lock()
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Laedt das Protokoll einmalig aus dem Speicher."""
+        async with self._lock:
+            if self._loaded:
+                return
+            data = await self._store.async_load() or {}
+            self._requests = data.get("requests", {})
+            self._loaded = True
+
+    @staticmethod
+    def _key(token: str) -> str:
+        # Der Schluessel selbst wird nicht im Klartext abgelegt
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    @staticmethod
+    def _window_start() -> float:
+        # Das Limit von solarprognose.de gilt je Kalendertag
+        return dt_util.start_of_local_day().timestamp()
+
+    def requests_in_window(self, token: str) -> int:
+        """Anzahl der Abfragen im aktuellen Limit-Zeitraum."""
+        window_start = self._window_start()
+        return sum(1 for ts in self._requests.get(self._key(token), []) if ts >= window_start)
+
+    @callback
+    def async_add_listener(self, token: str, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Meldet Aenderungen am Zaehler eines Schluessels (neue Abfrage, neuer Tag)."""
+        key = self._key(token)
+        self._listeners.setdefault(key, []).append(update_callback)
+        # Zu Beginn eines neuen Limit-Zeitraums faellt der Zaehler auf 0
+        if self._unsub_midnight is None:
+            self._unsub_midnight = async_track_time_change(
+                self._hass, self._async_handle_midnight, hour=0, minute=0, second=0
+            )
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners[key].remove(update_callback)
+            if not self._listeners[key]:
+                del self._listeners[key]
+            if not self._listeners and self._unsub_midnight:
+                self._unsub_midnight()
+                self._unsub_midnight = None
+
+        return remove_listener
+
+    @callback
+    def _async_handle_midnight(self, now: datetime) -> None:
+        for callbacks in list(self._listeners.values()):
+            for update_callback in list(callbacks):
+                update_callback()
+
+    @callback
+    def async_record(self, token: str) -> None:
+        """Vermerkt eine Abfrage und entfernt Eintraege aus frueheren Zeitraeumen."""
+        window_start = self._window_start()
+        key = self._key(token)
+        self._requests[key] = [
+            ts for ts in self._requests.get(key, []) if ts >= window_start
+        ] + [dt_util.utcnow().timestamp()]
+        self._store.async_delay_save(lambda: {"requests": self._requests}, SAVE_DELAY)
+        # Alle Eintraege mit diesem Schluessel sofort informieren, auch bei Abfragen des Config-Flows
+        for update_callback in list(self._listeners.get(key, [])):
+            update_callback()
+
+
+async def async_get_ledger(hass: HomeAssistant) -> QuotaLedger:
+    """Liefert das gemeinsame, geladene Abfrageprotokoll."""
+    if (ledger := hass.data.get(DATA_LEDGER)) is None:
+        ledger = hass.data[DATA_LEDGER] = QuotaLedger(hass)
+    await ledger.async_load()
+    return ledger
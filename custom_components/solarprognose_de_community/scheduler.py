@@ -0,0 +1,92 @@
+"""Gemeinsame Ablaufsteuerung fuer die Abrufe aller Solarprognose-Eintraege."""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DATA_SCHEDULER,
+    DEFAULT_MAX_PARALLEL_REQUESTS,
+    DEFAULT_REFRESH_SPREAD,
+    DEFAULT_REQUEST_SPACING,
+)
+
+
+class SolarPrognoseScheduler:
+    """Verteilt die Abrufe mehrerer Eintraege zeitlich und begrenzt parallele Anfragen.
+
+    Abrufe werden ueber `slot()` begrenzt, die Veroeffentlichung der Ergebnisse (und damit
+    die Sensor-Updates) ueber `async_wait_publish()` mit Mindestabstand gestaffelt.
+    Das API-Limit prueft nicht der Scheduler, sondern der Coordinator direkt vor jeder
+    Abfrage anhand des gemeinsamen Abfrageprotokolls (siehe ledger.py).
+    """
+
+    def __init__(
+        self,
+        spread: timedelta = DEFAULT_REFRESH_SPREAD,
+        max_parallel: int = DEFAULT_MAX_PARALLEL_REQUESTS,
+        spacing: timedelta = DEFAULT_REQUEST_SPACING,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self.spread = spread
+        self.spacing = spacing
+        self._semaphore = asyncio.Semaphore(max_parallel)
+        self._clock = clock
+        self._sleep = sleep
+        self._next_publish = 0.0
+        self._pending_first_refreshes = 0
+
+    def next_interval(self, base: timedelta) -> timedelta:
+        """Basisintervall plus zufaelliger Versatz innerhalb des Verteilungsfensters.
+
+        Der Versatz wird nur addiert, damit das API-Limit nie schneller erreicht wird.
+        """
+        return base + timedelta(seconds=random.uniform(0, self.spread.total_seconds()))
+
+    @asynccontextmanager
+    async def first_refresh_slot(self) -> AsyncIterator[None]:
+        """Staffelt erste Abrufe im Hintergrund nach der Zahl der gerade wartenden Eintraege.
+
+        Ein einzelner Eintrag (oder ein Reload) startet sofort, beim HA-Start folgen die
+        weiteren Eintraege jeweils im Mindestabstand.
+        """
+        delay = self._pending_first_refreshes * self.spacing.total_seconds()
+        self._pending_first_refreshes += 1
+        try:
+            if delay:
+                await self._sleep(delay)
+            yield
+        finally:
+            self._pending_first_refreshes -= 1
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Begrenzt die Anzahl gleichzeitig laufender Abfragen."""
+        async with self._semaphore:
+            yield
+
+    async def async_wait_publish(self) -> None:
+        """Wartet, bis ein Ergebnis mit Mindestabstand zum vorherigen veroeffentlicht werden darf.
+
+        Unterschiedliche Antwortzeiten der API koennen Abrufe sonst wieder zusammenfuehren,
+        daher wird der Abstand erst hier und nicht beim Start der Abfrage erzwungen.
+        """
+        now = self._clock()
+        publish_at = max(now, self._next_publish)
+        self._next_publish = publish_at + self.spacing.total_seconds()
+        if publish_at > now:
+            await self._sleep(publish_at - now)
+
+
+def async_get_scheduler(hass: HomeAssistant) -> SolarPrognoseScheduler:
+    """Liefert die gemeinsame Scheduler-Instanz und legt sie bei Bedarf an."""
+    if (scheduler := hass.data.get(DATA_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_SCHEDULER] = SolarPrognoseScheduler()
+    return scheduler
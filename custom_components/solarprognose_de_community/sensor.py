@@ -4,17 +4,18 @@ from dataclasses import dataclass
 from typing import Callable, Any
 
 from homeassistant.components.sensor import (
-    SensorEntity,
+    RestoreSensor,
     SensorDeviceClass,
     SensorStateClass,
     SensorEntityDescription,
 )
 from homeassistant.const import UnitOfEnergy, UnitOfPower
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .const import API_REQUEST_LIMIT, DEFAULT_FORECAST_DAYS, DOMAIN, MAX_FORECAST_DAYS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,35 +23,60 @@ _LOGGER = logging.getLogger(__name__)
 class SolarSensorEntityDescription(SensorEntityDescription):
     value_fn: Callable[[Any], Any] = None
     attr_fn: Callable[[Any], dict[str, Any]] = None
+    # Wert gilt nur fuer den Tag, an dem er berechnet wurde (nicht ueber Mitternacht wiederherstellen)
+    day_relative: bool = True
 
-SENSOR_TYPES: tuple[SolarSensorEntityDescription, ...] = (
-    SolarSensorEntityDescription(
-        key="today_total",
-        translation_key="today_total",
-        device_class=SensorDeviceClass.ENERGY,
-        state_class=SensorStateClass.TOTAL,
-        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
-        # Summiert alle Werte des aktuellen Kalendertages
-        value_fn=lambda coord: round(sum(val for dt, val in (coord.data or {}).items() 
-            if dt.date() == dt_util.now().date()), 2),
-    ),
-    SolarSensorEntityDescription(
-        key="tomorrow_total",
-        translation_key="tomorrow_total",
-        device_class=SensorDeviceClass.ENERGY,
-        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
-        state_class=SensorStateClass.TOTAL,
-        value_fn=lambda coord: round(sum(val for dt, val in (coord.data or {}).items() 
-            if dt.date() == (dt_util.now().date() + timedelta(days=1))), 2),
-    ),
+# Die ersten beiden Tage behalten ihre bisherigen Schluessel, damit die Unique-IDs erhalten bleiben
+DAY_SUFFIXES = {0: "today", 1: "tomorrow"}
+
+def _day_sensor_types(offset: int) -> tuple[SolarSensorEntityDescription, ...]:
+    """Tagessumme, Spitzenleistung und deren Zeitpunkt fuer heute + `offset` Tage."""
+    suffix = DAY_SUFFIXES.get(offset, f"day_{offset}")
+    placeholders = None if offset in DAY_SUFFIXES else {"day": str(offset)}
+    translation_suffix = suffix if offset in DAY_SUFFIXES else "day_n"
+
+    # Alle Werte kommen aus der Tagestabelle des Coordinators, ohne die Daten erneut zu durchlaufen.
+    # Liefert die API den Tag nicht, bleibt der Sensor leer statt 0 in die Statistik zu schreiben.
+    def bucket(coord):
+        return coord.series.days.get(dt_util.now().date() + timedelta(days=offset))
+
+    return (
+        SolarSensorEntityDescription(
+            key=f"{suffix}_total",
+            translation_key=f"{translation_suffix}_total",
+            translation_placeholders=placeholders,
+            device_class=SensorDeviceClass.ENERGY,
+            state_class=SensorStateClass.TOTAL,
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            value_fn=lambda coord: round(b.total, 2) if (b := bucket(coord)) else None,
+        ),
+        SolarSensorEntityDescription(
+            key=f"peak_power_{suffix}",
+            translation_key=f"peak_power_{translation_suffix}",
+            translation_placeholders=placeholders,
+            device_class=SensorDeviceClass.POWER,
+            native_unit_of_measurement=UnitOfPower.WATT,
+            state_class=SensorStateClass.MEASUREMENT,
+            value_fn=lambda coord: int(b.peak_power * 1000) if (b := bucket(coord)) else None,
+        ),
+        SolarSensorEntityDescription(
+            key=f"peak_time_{suffix}",
+            translation_key=f"peak_time_{translation_suffix}",
+            translation_placeholders=placeholders,
+            device_class=SensorDeviceClass.TIMESTAMP,
+            value_fn=lambda coord: b.peak_time if (b := bucket(coord)) else None,
+        ),
+    )
+
+BASE_SENSOR_TYPES: tuple[SolarSensorEntityDescription, ...] = (
     SolarSensorEntityDescription(
         key="rest_day",
         translation_key="rest_day",
         device_class=SensorDeviceClass.ENERGY,
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         state_class=SensorStateClass.TOTAL,
-        value_fn=lambda coord: round(sum(val for dt, val in (coord.data or {}).items() 
-            if dt >= dt_util.now() and dt.date() == dt_util.now().date()), 2),
+        value_fn=lambda coord: round(coord.series.day_total(dt_util.now().date())
+            - coord.series.energy_until(dt_util.now(), inclusive=False), 2),
     ),
     SolarSensorEntityDescription(
         key="current_hour",
@@ -70,32 +96,6 @@ SENSOR_TYPES: tuple[SolarSensorEntityDescription, ...] = (
         value_fn=lambda coord: int((coord.data or {}).get(
             (dt_util.now() + timedelta(hours=1)).replace(minute=0, second=0, microsecond=0), 0) * 1000),
     ),
-    SolarSensorEntityDescription(
-        key="peak_power_today",
-        translation_key="peak_power_today",
-        device_class=SensorDeviceClass.POWER,
-        native_unit_of_measurement=UnitOfPower.WATT,
-        state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda coord: int(max([val for dt, val in (coord.data or {}).items() 
-            if dt.date() == dt_util.now().date()] or [0]) * 1000),
-    ),
-    SolarSensorEntityDescription(
-        key="peak_time_today",
-        translation_key="peak_time_today",
-        device_class=SensorDeviceClass.TIMESTAMP,
-        value_fn=lambda coord: (
-            max([(val, dt) for dt, val in (coord.data or {}).items() if dt.date() == dt_util.now().date()] or [(0, None)])[1]
-        ),
-    ),
-    SolarSensorEntityDescription(
-        key="peak_power_tomorrow",
-        translation_key="peak_power_tomorrow",
-        device_class=SensorDeviceClass.POWER,
-        native_unit_of_measurement=UnitOfPower.WATT,
-        state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda coord: int(max([val for dt, val in (coord.data or {}).items() 
-            if dt.date() == (dt_util.now().date() + timedelta(days=1))] or [0]) * 1000),
-    ),
     SolarSensorEntityDescription(
         key="forecast",
         translation_key="forecast",
@@ -103,57 +103,72 @@ SENSOR_TYPES: tuple[SolarSensorEntityDescription, ...] = (
         state_class=SensorStateClass.TOTAL_INCREASING,
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         # Erzeugt den gleitenden Prognose-Wert für das HA-Energie-Dashboard
-        value_fn=lambda coord: round(sum(val for dt, val in (coord.data or {}).items() 
-            if dt.date() == dt_util.now().date() and dt <= dt_util.now()), 2),
+        value_fn=lambda coord: round(coord.series.energy_until(dt_util.now()), 2),
         attr_fn=lambda coord: {
             "forecast": [{"datetime": dt.isoformat(), "energy": val} 
-                         for dt, val in sorted((coord.data or {}).items())],
+                         for dt, val in zip(coord.series.times, coord.series.power)],
             "integrated_forecast": True
         }
     ),
-    SolarSensorEntityDescription(
-        key="peak_time_tomorrow",
-        translation_key="peak_time_tomorrow",
-        device_class=SensorDeviceClass.TIMESTAMP,
-        value_fn=lambda coord: (
-            max([(val, dt) for dt, val in (coord.data or {}).items() 
-                if dt.date() == (dt_util.now().date() + timedelta(days=1))] or [(0, None)])[1]
-        ),
-    ),
     SolarSensorEntityDescription(
         key="api_count",
         translation_key="api_count",
         state_class=SensorStateClass.TOTAL_INCREASING,
         icon="mdi:api",
+        # Kommt aus dem gespeicherten Abfrageprotokoll und ueberlebt damit HA-Neustarts
         value_fn=lambda coord: coord.api_count_today,
+        attr_fn=lambda coord: {"api_limit": API_REQUEST_LIMIT},
     ),
     SolarSensorEntityDescription(
         key="api_status",
         translation_key="api_status",
         value_fn=lambda coord: "OK" if coord.api_status == 0 else "Fehler",
         attr_fn=lambda coord: {"api_message": coord.api_message},
+        day_relative=False,
     ),
     SolarSensorEntityDescription(
         key="next_update", 
         translation_key="next_update", 
         device_class=SensorDeviceClass.TIMESTAMP, 
-        value_fn=lambda coord: coord.next_api_request 
+        value_fn=lambda coord: coord.next_api_request,
+        day_relative=False,
     ),
     SolarSensorEntityDescription(
         key="last_update", 
         translation_key="last_update", 
         device_class=SensorDeviceClass.TIMESTAMP, 
-        value_fn=lambda coord: coord.last_api_success
+        value_fn=lambda coord: coord.last_api_success,
+        day_relative=False,
     ),
 )
 
+def build_sensor_types(forecast_days: int) -> tuple[SolarSensorEntityDescription, ...]:
+    """Feste Sensoren plus je eine Sensorfamilie fuer jeden Tag des Prognosehorizonts."""
+    return BASE_SENSOR_TYPES + tuple(
+        desc for offset in range(forecast_days) for desc in _day_sensor_types(offset)
+    )
+
+SENSOR_TYPES = build_sensor_types(DEFAULT_FORECAST_DAYS)
+
 async def async_setup_entry(hass, entry, async_add_entities):
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     custom_name = entry.data.get("name", "Solarprognose")
-    async_add_entities(SolarSensor(coordinator, entry, custom_name, desc) for desc in SENSOR_TYPES)
+    forecast_days = entry.options.get("forecast_days", DEFAULT_FORECAST_DAYS)
 
-class SolarSensor(CoordinatorEntity, RestoreEntity, SensorEntity):
+    # Nach Verkleinern des Prognosehorizonts die nicht mehr erzeugten Tagessensoren entfernen
+    registry = er.async_get(hass)
+    for offset in range(forecast_days, MAX_FORECAST_DAYS):
+        for desc in _day_sensor_types(offset):
+            unique_id = f"{entry.entry_id}_{desc.key}"
+            if entity_id := registry.async_get_entity_id("sensor", DOMAIN, unique_id):
+                registry.async_remove(entity_id)
+
+    sensor_types = build_sensor_types(forecast_days)
+    async_add_entities(SolarSensor(coordinator, entry, custom_name, desc) for desc in sensor_types)
+
+class SolarSensor(CoordinatorEntity, RestoreSensor):
     _attr_has_entity_name = True
+    _restored_value = None
 
     def __init__(self, coordinator, entry, custom_name, description):
         super().__init__(coordinator)
@@ -169,25 +184,41 @@ class SolarSensor(CoordinatorEntity, RestoreEntity, SensorEntity):
     async def async_added_to_hass(self) -> None:
         """Wird aufgerufen, wenn die Entitaet hinzugefuegt wird."""
         await super().async_added_to_hass()
-        
-        # Verhindert, dass der api_count nach einem HA-Neustart bei 0 beginnt, 
-        # falls heute bereits Abfragen stattgefunden haben.
-        if self.entity_description.key == "api_count":
-            last_state = await self.async_get_last_state()
-            if last_state and last_state.state not in (None, "unknown", "unavailable"):
-                try:
-                    restored_count = int(last_state.state)
-                    if restored_count > self.coordinator.api_count_today:
-                        self.coordinator.api_count_today = restored_count
-                except ValueError:
-                    _LOGGER.error("Konnte API Count nicht wiederherstellen: %s", last_state.state)
+
+        # Der Zaehler folgt dem gemeinsamen Abfrageprotokoll direkt, nicht erst dem naechsten Abruf
+        if self.entity_description.key == "api_count" and self.coordinator.ledger:
+            self.async_on_remove(self.coordinator.ledger.async_add_listener(
+                self.coordinator.api_token, self.async_write_ha_state
+            ))
+
+        # Solange der erste Abruf im verzoegerten Setup noch aussteht, den letzten Zustand anzeigen
+        if not self.coordinator.first_refresh_pending:
+            return
+        last_state = await self.async_get_last_state()
+        last_data = await self.async_get_last_sensor_data()
+        if last_state is None or last_data is None:
+            return
+        # Tageswerte von gestern waeren als heutige Werte falsch
+        if (self.entity_description.day_relative
+                and dt_util.as_local(last_state.last_updated).date() != dt_util.now().date()):
+            return
+        self._restored_value = last_data.native_value
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Nach dem ersten Abruf gelten nur noch die aktuellen Daten."""
+        self._restored_value = None
+        super()._handle_coordinator_update()
 
     @property
     def native_value(self):
         """Gibt den aktuellen Status des Sensors zurueck."""
         # Verhindert Fehlermeldungen im Log, wenn noch keine Daten vom Coordinator vorliegen
         if not self.coordinator.data and self.entity_description.key not in ["api_count", "api_status"]:
-            return None
+            return self._restored_value
+        # Vor der ersten Antwort der API gibt es keinen Status, also auch keinen Fehler
+        if self.entity_description.key == "api_status" and self.coordinator.api_status is None:
+            return self._restored_value
         return self.entity_description.value_fn(self.coordinator)
 
     @property
@@ -167,4 +167,27 @@ async def test_options_flow_direct(hass: HomeAssistant) -> None:
         })
 
     assert result2["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
-    assert result2["data"]["api_key"] == "new_super_key"
\ No newline at end of file
+    assert result2["data"]["api_key"] == "new_super_key"
+
+@pytest.mark.asyncio
+async def test_options_flow_without_credential_change(hass: HomeAssistant) -> None:
+    """Testet, dass reine Optionsaenderungen kein API-Credit fuer einen Test-Aufruf verbrauchen."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"api_key": "key", "api_url": ""})
+    entry.add_to_hass(hass)
+
+    flow = config_flow.SolarPrognoseOptionsFlowHandler()
+    flow.hass = hass
+    flow._config_entry = entry
+
+    mock_session = get_mock_session(status=0)
+    patch_target = "custom_components.solarprognose_de_community.config_flow.async_get_clientsession"
+
+    with patch(patch_target, return_value=mock_session):
+        result = await flow.async_step_init(user_input={
+            "api_key": "key",
+            "api_url": "",
+            "deferred_setup": True,
+        })
+
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    mock_session.get.assert_not_called()
@@ -24,4 +24,54 @@ async def test_coordinator_api_error(hass):
         await coordinator._async_update_data()
         
         assert coordinator.api_status == 1
-        assert coordinator.api_message == "Access denied"
\ No newline at end of file
+        assert coordinator.api_message == "Access denied"
+
+async def test_coordinator_keeps_all_columns(hass, mock_api_data):
+    """Testet, dass alle Spalten der API-Antwort erhalten bleiben."""
+    coordinator = SolarPrognoseCoordinator(hass, api_key="test")
+    mock_api_data["data"] = {"1700000000": [1.5, 1.5], "1700003600": [2.0, 3.5]}
+
+    with patch("custom_components.solarprognose_de_community.coordinator.async_get_clientsession") as mock_get_session:
+        mock_response = AsyncMock()
+        mock_response.json.return_value = mock_api_data
+        mock_response.__aenter__.return_value = mock_response
+        mock_get_session.return_value.get.return_value = mock_response
+
+        await coordinator._async_update_data()
+
+    assert list(coordinator.data.values()) == [1.5, 2.0]
+    assert coordinator.series.columns == [[1.5, 2.0], [1.5, 3.5]]
+    assert coordinator.series.cumulative == [1.5, 3.5]
+
+
+async def test_coordinator_skips_when_quota_used(hass):
+    """Testet, dass bei erreichtem Limit keine Anfrage mehr gesendet wird."""
+    from custom_components.solarprognose_de_community.const import API_REQUEST_LIMIT
+    from custom_components.solarprognose_de_community.ledger import async_get_ledger
+
+    ledger = await async_get_ledger(hass)
+    for _ in range(API_REQUEST_LIMIT):
+        ledger.async_record("limit-key")
+
+    coordinator = SolarPrognoseCoordinator(hass, api_key="limit-key", ledger=ledger)
+    with patch("custom_components.solarprognose_de_community.coordinator.async_get_clientsession") as mock_get_session:
+        result = await coordinator._async_update_data()
+
+    assert result == {}
+    assert coordinator.api_count_today == API_REQUEST_LIMIT
+    mock_get_session.assert_not_called()
+
+
+async def test_coordinator_malformed_row(hass, mock_api_data):
+    """Testet, dass eine fehlerhafte Zeile der API zu UpdateFailed fuehrt."""
+    coordinator = SolarPrognoseCoordinator(hass, api_key="test")
+    mock_api_data["data"] = {"1700000000": []}
+
+    with patch("custom_components.solarprognose_de_community.coordinator.async_get_clientsession") as mock_get_session:
+        mock_response = AsyncMock()
+        mock_response.json.return_value = mock_api_data
+        mock_response.__aenter__.return_value = mock_response
+        mock_get_session.return_value.get.return_value = mock_response
+
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
@@ -0,0 +1,54 @@
+from datetime import timedelta
+from homeassistant.util import dt as dt_util
+from custom_components.solarprognose_de_community.forecast import ForecastSeries
+
+def _day_start():
+    return dt_util.start_of_local_day()
+
+async def test_forecast_uses_api_cumulative():
+    """Die kumulierte Reihe der API wird uebernommen, wenn sie zu den Stundenwerten passt."""
+    start = _day_start() + timedelta(hours=8)
+    rows = {
+        start: [1.0, 1.0],
+        start + timedelta(hours=1): [2.0, 3.0],
+        start + timedelta(hours=2): [0.5, 3.5],
+    }
+    series = ForecastSeries.from_rows(rows)
+
+    assert series.inconsistencies == []
+    assert series.cumulative is series.columns[1]
+    assert series.day_total(start.date()) == 3.5
+    assert series.energy_until(start + timedelta(hours=1, minutes=30)) == 3.0
+    assert series.energy_until(start + timedelta(hours=1), inclusive=False) == 1.0
+    assert series.energy_until(start - timedelta(hours=1)) == 0.0
+
+async def test_forecast_detects_inconsistent_api_cumulative():
+    """Abweichende API-Summen werden gemeldet und durch eigene Summen ersetzt."""
+    start = _day_start() + timedelta(hours=8)
+    rows = {
+        start: [1.0, 1.0],
+        start + timedelta(hours=1): [2.0, 5.0],
+        start + timedelta(days=1): [4.0, 4.0],
+    }
+    series = ForecastSeries.from_rows(rows)
+
+    assert series.inconsistencies == [start + timedelta(hours=1)]
+    assert series.day_total(start.date()) == 3.0
+    assert series.day_total((start + timedelta(days=1)).date()) == 4.0
+    assert series.day_total((start + timedelta(days=2)).date()) == 0.0
+
+async def test_forecast_day_buckets():
+    """Die Tagestabelle liefert Summe und Spitze je Tag aus einem Durchlauf."""
+    start = _day_start() + timedelta(hours=10)
+    rows = {
+        start + timedelta(days=day, hours=hour): [power]
+        for day in range(3)
+        for hour, power in enumerate((1.0, 3.0 + day, 2.0))
+    }
+    series = ForecastSeries.from_rows(rows)
+
+    assert len(series.days) == 3
+    day_2 = series.days[(start + timedelta(days=2)).date()]
+    assert day_2.total == 8.0
+    assert day_2.peak_power == 5.0
+    assert day_2.peak_time == start + timedelta(days=2, hours=1)
@@ -0,0 +1,56 @@
+from datetime import timedelta
+from unittest.mock import patch, AsyncMock
+import pytest
+from homeassistant.exceptions import ConfigEntryNotReady
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from custom_components.solarprognose_de_community import async_setup_entry
+from custom_components.solarprognose_de_community.const import DOMAIN
+
+COORDINATOR = "custom_components.solarprognose_de_community.coordinator.SolarPrognoseCoordinator"
+
+async def test_setup_deferred_first_refresh(hass):
+    """Im verzoegerten Modus wird nicht auf die API gewartet, der Abruf laeuft im Hintergrund."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"api_key": "test"}, options={"deferred_setup": True})
+    entry.add_to_hass(hass)
+
+    with patch(f"{COORDINATOR}.async_config_entry_first_refresh") as mock_first, \
+         patch(f"{COORDINATOR}.async_refresh", new_callable=AsyncMock) as mock_refresh, \
+         patch.object(hass.config_entries, "async_forward_entry_setups", new_callable=AsyncMock):
+        assert await async_setup_entry(hass, entry)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    mock_first.assert_not_called()
+    mock_refresh.assert_awaited_once()
+    assert coordinator.setup_duration is not None
+    assert coordinator.first_refresh_duration is not None
+
+async def test_setup_blocking_first_refresh_fails(hass):
+    """Ohne verzoegerten Modus fuehrt ein fehlgeschlagener erster Abruf zu ConfigEntryNotReady."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"api_key": "test"})
+    entry.add_to_hass(hass)
+
+    with patch(f"{COORDINATOR}.async_config_entry_first_refresh", side_effect=Exception("offline")):
+        with pytest.raises(ConfigEntryNotReady):
+            await async_setup_entry(hass, entry)
+
+
+async def test_setup_deferred_first_refresh_retries(hass):
+    """Schlaegt der erste Abruf im Hintergrund fehl, wird er mit kurzer Wartezeit wiederholt."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"api_key": "test"}, options={"deferred_setup": True})
+    entry.add_to_hass(hass)
+    results = iter([False, False, True])
+
+    async def refresh(self):
+        self.last_update_success = next(results)
+
+    with patch(f"{COORDINATOR}.async_refresh", autospec=True, side_effect=refresh) as mock_refresh, \
+         patch.object(hass.config_entries, "async_forward_entry_setups", new_callable=AsyncMock), \
+         patch("custom_components.solarprognose_de_community.FIRST_REFRESH_RETRY_DELAYS",
+               (timedelta(0),) * 4):
+        assert await async_setup_entry(hass, entry)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    # Erster Versuch plus zwei Wiederholungen, danach wieder das normale Intervall
+    assert mock_refresh.call_count == 3
+    assert hass.data[DOMAIN][entry.entry_id]["coordinator"].first_refresh_pending is False
@@ -0,0 +1,50 @@
+from datetime import timedelta
+from homeassistant.util import dt as dt_util
+from custom_components.solarprognose_de_community.ledger import (
+    QuotaLedger,
+    STORAGE_KEY,
+    api_token,
+    async_get_ledger,
+)
+
+async def test_api_token_from_url():
+    """Der Schluessel wird aus Key oder URL ermittelt."""
+    assert api_token(None, "abc") == "abc"
+    assert api_token("https://example.org/api?access-token=xyz&type=hourly", None) == "xyz"
+
+async def test_ledger_counts_only_current_window(hass, hass_storage):
+    """Nur Abfragen seit Tagesbeginn zaehlen, alte Eintraege werden verworfen."""
+    yesterday = (dt_util.start_of_local_day() - timedelta(hours=1)).timestamp()
+    key = QuotaLedger._key("token")
+    hass_storage[STORAGE_KEY] = {"version": 1, "data": {"requests": {key: [yesterday]}}}
+
+    ledger = await async_get_ledger(hass)
+    assert ledger.requests_in_window("token") == 0
+
+    ledger.async_record("token")
+    ledger.async_record("token")
+    assert ledger.requests_in_window("token") == 2
+    assert ledger.requests_in_window("other") == 0
+    assert len(ledger._requests[key]) == 2
+    assert await async_get_ledger(hass) is ledger
+
+async def test_ledger_notifies_listeners(hass):
+    """Listener erfahren sofort von neuen Abfragen ihres Schluessels und vom Tageswechsel."""
+    from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+    ledger = await async_get_ledger(hass)
+    calls = []
+    unsub = ledger.async_add_listener("token", lambda: calls.append("token"))
+
+    ledger.async_record("token")
+    ledger.async_record("other")
+    assert calls == ["token"]
+
+    async_fire_time_changed(hass, dt_util.start_of_local_day() + timedelta(days=1))
+    await hass.async_block_till_done()
+    assert calls == ["token", "token"]
+
+    unsub()
+    ledger.async_record("token")
+    assert calls == ["token", "token"]
+    assert ledger._unsub_midnight is None
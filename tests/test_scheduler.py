@@ -0,0 +1,77 @@
+import asyncio
+from datetime import timedelta
+from custom_components.solarprognose_de_community.const import DATA_SCHEDULER, UPDATE_INTERVAL
+from custom_components.solarprognose_de_community.scheduler import (
+    SolarPrognoseScheduler,
+    async_get_scheduler,
+)
+
+async def test_scheduler_shared_instance(hass):
+    """Alle Eintraege teilen sich denselben Scheduler."""
+    scheduler = async_get_scheduler(hass)
+    assert async_get_scheduler(hass) is scheduler
+    assert hass.data[DATA_SCHEDULER] is scheduler
+
+async def test_scheduler_interval_jitter():
+    """Der Versatz liegt immer innerhalb des Verteilungsfensters."""
+    scheduler = SolarPrognoseScheduler(spread=timedelta(minutes=10))
+    for _ in range(50):
+        interval = scheduler.next_interval(UPDATE_INTERVAL)
+        assert UPDATE_INTERVAL <= interval <= UPDATE_INTERVAL + timedelta(minutes=10)
+
+async def test_scheduler_limits_parallel_requests():
+    """Es laufen nie mehr Abfragen gleichzeitig als erlaubt."""
+    scheduler = SolarPrognoseScheduler(max_parallel=2)
+    release = asyncio.Event()
+    running = 0
+    peak = 0
+
+    async def fetch():
+        nonlocal running, peak
+        async with scheduler.slot():
+            running += 1
+            peak = max(peak, running)
+            # Die Abfrage dauert, bis der Test sie freigibt
+            await release.wait()
+            running -= 1
+
+    tasks = [asyncio.create_task(fetch()) for _ in range(5)]
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert running == 2
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert peak == 2
+
+async def test_scheduler_spaces_publishing():
+    """Gleichzeitig fertige Ergebnisse werden mit Mindestabstand veroeffentlicht."""
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    # Die Uhr steht still: alle Ergebnisse kommen im selben Moment an
+    scheduler = SolarPrognoseScheduler(
+        spacing=timedelta(seconds=2), clock=lambda: 100.0, sleep=fake_sleep
+    )
+    for _ in range(4):
+        await scheduler.async_wait_publish()
+
+    assert delays == [2.0, 4.0, 6.0]
+
+async def test_scheduler_first_refresh_slot():
+    """Ein einzelner erster Abruf startet sofort, gleichzeitige werden gestaffelt."""
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    scheduler = SolarPrognoseScheduler(spacing=timedelta(seconds=2), sleep=fake_sleep)
+    async with scheduler.first_refresh_slot():
+        async with scheduler.first_refresh_slot():
+            pass
+    async with scheduler.first_refresh_slot():
+        pass
+
+    assert delays == [2.0]
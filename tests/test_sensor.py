@@ -3,6 +3,7 @@ from unittest.mock import patch, MagicMock
 from datetime import timedelta
 from homeassistant.util import dt as dt_util
 from custom_components.solarprognose_de_community.const import DOMAIN
+from custom_components.solarprognose_de_community.forecast import ForecastSeries
 
 async def test_sensors_calculation(hass, mock_api_data):
     """Testet, ob die Sensoren die API-Daten korrekt summieren."""
@@ -12,9 +13,9 @@ async def test_sensors_calculation(hass, mock_api_data):
     tomorrow = now + timedelta(days=1)
     
     # API-Daten simulieren: 2 kWh heute, 3 kWh morgen
-    mock_data = {
-        now: 2.0,
-        tomorrow: 3.0
+    mock_rows = {
+        now: [2.0],
+        tomorrow: [3.0]
     }
 
     # 2. Coordinator mit Mock-Daten fuettern
@@ -25,7 +26,7 @@ async def test_sensors_calculation(hass, mock_api_data):
         
         from custom_components.solarprognose_de_community.coordinator import SolarPrognoseCoordinator
         coordinator = SolarPrognoseCoordinator(hass, api_key="test")
-        coordinator.data = mock_data
+        coordinator.set_forecast(ForecastSeries.from_rows(mock_rows))
         
         # In hass.data registrieren, damit sensor.py ihn findet
         hass.data[DOMAIN] = {entry.entry_id: {"coordinator": coordinator}}
@@ -47,4 +48,108 @@ async def test_sensors_calculation(hass, mock_api_data):
         # (2.0 kWh * 1000 = 2000 W)
         curr_hour_desc = next(s for s in SENSOR_TYPES if s.key == "current_hour")
         sensor_power = SolarSensor(coordinator, entry, "Solar", curr_hour_desc)
-        assert sensor_power.native_value == 2000
\ No newline at end of file
+        assert sensor_power.native_value == 2000
+
+        # Test: Prognose (forecast) enthaelt die aktuelle Stunde, Resttag nur spaetere Stunden
+        forecast_desc = next(s for s in SENSOR_TYPES if s.key == "forecast")
+        sensor_forecast = SolarSensor(coordinator, entry, "Solar", forecast_desc)
+        assert sensor_forecast.native_value == 2.0
+        assert sensor_forecast.extra_state_attributes["forecast"][0]["energy"] == 2.0
+
+        rest_desc = next(s for s in SENSOR_TYPES if s.key == "rest_day")
+        sensor_rest = SolarSensor(coordinator, entry, "Solar", rest_desc)
+        assert sensor_rest.native_value == 0.0
+
+
+async def test_sensor_forecast_horizon(hass):
+    """Testet die Sensorfamilien fuer weitere Tage des Prognosehorizonts."""
+    from custom_components.solarprognose_de_community.coordinator import SolarPrognoseCoordinator
+    from custom_components.solarprognose_de_community.sensor import build_sensor_types, SolarSensor
+
+    now = dt_util.now().replace(minute=0, second=0, microsecond=0)
+    coordinator = SolarPrognoseCoordinator(hass, api_key="test")
+    coordinator.set_forecast(ForecastSeries.from_rows(
+        {now + timedelta(days=2): [1.5], now + timedelta(days=2, hours=1): [0.5]}
+    ))
+
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+    sensor_types = {desc.key: desc for desc in build_sensor_types(3)}
+
+    # Heute/Morgen behalten ihre bisherigen Schluessel, Tag +2 kommt hinzu
+    assert {"today_total", "peak_time_tomorrow", "day_2_total"} <= sensor_types.keys()
+    assert "day_3_total" not in sensor_types
+    assert sensor_types["day_2_total"].translation_placeholders == {"day": "2"}
+
+    assert SolarSensor(coordinator, entry, "Solar", sensor_types["day_2_total"]).native_value == 2.0
+    assert SolarSensor(coordinator, entry, "Solar", sensor_types["peak_power_day_2"]).native_value == 1500
+    assert SolarSensor(coordinator, entry, "Solar", sensor_types["peak_time_day_2"]).native_value == now + timedelta(days=2)
+    # Tage ohne API-Daten bleiben leer
+    assert SolarSensor(coordinator, entry, "Solar", sensor_types["today_total"]).native_value is None
+    assert SolarSensor(coordinator, entry, "Solar", sensor_types["peak_power_tomorrow"]).native_value is None
+
+
+async def test_sensor_restore_while_first_refresh_pending(hass):
+    """Im verzoegerten Setup zeigen Sensoren bis zum ersten Abruf ihren letzten Zustand von heute."""
+    from homeassistant.core import State
+    from pytest_homeassistant_custom_component.common import mock_restore_cache_with_extra_data
+    from custom_components.solarprognose_de_community.coordinator import SolarPrognoseCoordinator
+    from custom_components.solarprognose_de_community.sensor import SENSOR_TYPES, SolarSensor
+
+    yesterday = dt_util.now() - timedelta(days=1)
+    mock_restore_cache_with_extra_data(hass, (
+        (State("sensor.solar_today_total", "5.5"), {"native_value": 5.5, "native_unit_of_measurement": "kWh"}),
+        (State("sensor.solar_rest_day", "1.5", last_updated=yesterday),
+         {"native_value": 1.5, "native_unit_of_measurement": "kWh"}),
+        (State("sensor.solar_api_status", "OK", last_updated=yesterday),
+         {"native_value": "OK", "native_unit_of_measurement": None}),
+    ))
+
+    coordinator = SolarPrognoseCoordinator(hass, api_key="test")
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+    descriptions = {desc.key: desc for desc in SENSOR_TYPES}
+
+    async def add_sensor(key, pending):
+        coordinator.first_refresh_pending = pending
+        sensor = SolarSensor(coordinator, entry, "Solar", descriptions[key])
+        sensor.hass = hass
+        sensor.entity_id = f"sensor.solar_{key}"
+        await sensor.async_added_to_hass()
+        return sensor
+
+    # Erster Abruf steht noch aus: Wert von heute wird angezeigt, der von gestern nicht
+    assert (await add_sensor("today_total", True)).native_value == 5.5
+    assert (await add_sensor("rest_day", True)).native_value is None
+    assert (await add_sensor("api_status", True)).native_value == "OK"
+
+    # Ohne ausstehenden Abruf (blockierendes Setup) wird nichts wiederhergestellt
+    assert (await add_sensor("today_total", False)).native_value is None
+    # Vor der ersten Antwort zeigt der Status keinen Fehler an
+    assert (await add_sensor("api_status", False)).native_value is None
+
+    await coordinator.async_shutdown()
+
+
+async def test_sensor_setup_removes_days_beyond_horizon(hass):
+    """Testet, dass Tagessensoren ausserhalb des Horizonts aus der Registry entfernt werden."""
+    from homeassistant.helpers import entity_registry as er
+    from custom_components.solarprognose_de_community.coordinator import SolarPrognoseCoordinator
+    from custom_components.solarprognose_de_community.sensor import async_setup_entry
+
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+    entry.data = {"name": "Test Anlage"}
+    entry.options = {"forecast_days": 2}
+    hass.data[DOMAIN] = {entry.entry_id: {"coordinator": SolarPrognoseCoordinator(hass, api_key="test")}}
+
+    registry = er.async_get(hass)
+    kept = registry.async_get_or_create("sensor", DOMAIN, "test_entry_tomorrow_total")
+    removed = registry.async_get_or_create("sensor", DOMAIN, "test_entry_day_3_total")
+
+    added = []
+    await async_setup_entry(hass, entry, lambda entities: added.extend(entities))
+
+    assert registry.async_get(kept.entity_id) is not None
+    assert registry.async_get(removed.entity_id) is None
+    assert not any(sensor.entity_description.key.startswith("day_") for sensor in added)